@@ -35,6 +35,13 @@ class ArgConfig:
 
         testParser.add_argument("-f", "--filter", default=None)
 
+        testParser.add_argument(
+            "-n",
+            "--workers",
+            default="auto",
+            help="Number of parallel test workers: 'auto' for one per CPU, '0' to run serially",
+        )
+
         installParser = subparsers.add_parser(
             "install",
             help="Install project dependencies (not implemented yet)",
@@ -53,7 +60,7 @@ class ArgConfig:
 
         migrationParser = subparsers.add_parser(
             "migrate",
-            help="Run database migrations (not implemented yet)",
+            help="Run database migrations, or show the pending revisions and backfills ('status')",
         )
 
         migrationParser.add_argument(
@@ -68,6 +75,44 @@ class ArgConfig:
             help="Number of migrations to roll back (only works for 'down' action)",
         )
 
+        importTimeParser = subparsers.add_parser(
+            "importtime",
+            help="Report the slowest imports of a server module",
+        )
+
+        importTimeParser.add_argument(
+            "-m",
+            "--module",
+            default="server",
+            help="Module to import, relative to the server folder",
+        )
+
+        importTimeParser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of imports to report",
+        )
+
+        benchParser = subparsers.add_parser(
+            "bench",
+            help="Run the benchmark scripts",
+        )
+
+        benchParser.add_argument("-f", "--filter", default=None)
+
+        rebalanceParser = subparsers.add_parser(
+            "rebalance",
+            help="Move users to their shard after growing DATABASE_SHARD_URLS (stop the servers first)",
+        )
+
+        rebalanceParser.add_argument(
+            "--previous-count",
+            type=int,
+            required=True,
+            help="Number of shards before the new ones were appended",
+        )
+
         self._args = parser.parse_args()
 
     @property
@@ -1,4 +1,7 @@
+import hashlib
 import os
+import re
+import shutil
 import subprocess
 from typing import Any
 
@@ -9,19 +12,18 @@ def DetectPythonCommand() -> str:
     """
     Detect the appropriate Python command based on the operating system.
 
+    The command is looked up on the PATH instead of being run, so importing
+    the tooling does not spawn a process.
+
     Returns
     -------
     str
         The Python command to use ('python' or 'python3').
     """
-    pythonCommand = "python"
-
-    try:
-        RunCommand("python --version", shell=False)
-    except:
-        pythonCommand = "python3"
+    if shutil.which("python") is not None:
+        return "python"
 
-    return pythonCommand
+    return "python3"
 
 
 def DetectPythonExecutable() -> str:
@@ -62,10 +64,31 @@ from .constants import (
 )
 
 
+def HashFile(filePath: str) -> str:
+    """
+    Compute the content hash of a file.
+
+    Parameters
+    ----------
+    filePath : str
+        The path to the file to hash. Relative to the source directory.
+
+    Returns
+    -------
+    str
+        The hex encoded SHA-256 of the file content.
+    """
+    with open(filePath, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
 def CheckFileModified(filePath: str) -> bool:
     """
     Tool for file caching system.
 
+    The file is compared by content hash, so touching it (checkouts, rebases)
+    does not count as a modification.
+
     Parameters
     ----------
     filePath : str
@@ -80,15 +103,13 @@ def CheckFileModified(filePath: str) -> bool:
     if not os.path.exists(cacheFileStampPath):
         return True
 
-    fileModTime = os.path.getmtime(filePath)
-    if fileModTime > os.path.getmtime(cacheFileStampPath):
-        return True
-    return False
+    with open(cacheFileStampPath, "r") as f:
+        return f.read().strip() != HashFile(filePath)
 
 
 def CacheFileStamp(filePath: str) -> None:
     """
-    Try to update the file modification stamp in the cache.
+    Try to update the file content hash in the cache.
 
     Parameters
     ----------
@@ -102,7 +123,71 @@ def CacheFileStamp(filePath: str) -> None:
 
     os.makedirs(os.path.dirname(cacheFileStampPath), exist_ok=True)
     with open(cacheFileStampPath, "w") as f:
-        f.write("cached")
+        f.write(HashFile(filePath))
+
+
+def NormalizeRequirement(requirement: str) -> str | None:
+    """
+    Normalize a pinned requirement so it can be compared with pip's output.
+
+    Parameters
+    ----------
+    requirement : str
+        A line of a requirements file or of ``pip freeze``.
+
+    Returns
+    -------
+    str | None
+        The lower cased ``name==version`` pin, None if the line is not a pin.
+    """
+    requirement = requirement.split("#", 1)[0].strip()
+    if "==" not in requirement or requirement.startswith("-"):
+        return None
+
+    name, version = requirement.split("==", 1)
+    name = re.sub(r"[-_.]+", "-", name.split("[", 1)[0]).lower()
+    return f"{name.strip()}=={version.strip()}"
+
+
+def FindMissingRequirements(folder: str) -> list[str] | None:
+    """
+    Find the pins of requirements.txt that are not installed in the venv.
+
+    Parameters
+    ----------
+    folder : str
+        The folder containing the venv and requirements.txt (relative path to source dir).
+
+    Returns
+    -------
+    list[str] | None
+        The missing pins, None if requirements.txt holds lines that are not
+        plain pins and needs a full install.
+    """
+    result = subprocess.run(
+        f"{PYTHON_EXECUTABLE} -m pip freeze",
+        shell=True,
+        check=True,
+        cwd=folder,
+        capture_output=True,
+        text=True,
+    )
+    installed = {NormalizeRequirement(line) for line in result.stdout.splitlines()}
+
+    missing: list[str] = []
+    with open(os.path.join(folder, "requirements.txt"), "r") as f:
+        for line in f:
+            requirement = line.split("#", 1)[0].strip()
+            if not requirement:
+                continue
+
+            pin = NormalizeRequirement(requirement)
+            if pin is None:
+                return None
+            if pin not in installed:
+                missing.append(requirement)
+
+    return missing
 
 
 def RunCommand(
@@ -178,14 +263,47 @@ def InstallDependencies(folder: str) -> None:
         logger.info("Update the pip package manager...")
         RunCommand(f"{PYTHON_EXECUTABLE} -m pip install --upgrade pip", folder=folder)
 
-    logger.info("Installing required packages from requirements.txt...")
-    RunCommand(f"{PYTHON_EXECUTABLE} -m pip install -r requirements.txt", folder=folder)
+        logger.info("Installing required packages from requirements.txt...")
+        RunCommand(f"{PYTHON_EXECUTABLE} -m pip install -r requirements.txt", folder=folder)
+    else:
+        missingRequirements = FindMissingRequirements(folder)
+
+        if missingRequirements is None:
+            logger.info("Installing required packages from requirements.txt...")
+            RunCommand(
+                f"{PYTHON_EXECUTABLE} -m pip install -r requirements.txt", folder=folder
+            )
+        elif missingRequirements:
+            logger.info(f"Installing changed pins: {' '.join(missingRequirements)}")
+            RunCommand(
+                f"{PYTHON_EXECUTABLE} -m pip install "
+                + " ".join(f'"{pin}"' for pin in missingRequirements),
+                folder=folder,
+            )
 
     logger.info("Dependencies installed successfully.")
 
     CacheFileStamp(os.path.join(folder, "requirements.txt"))
 
 
+def EnsureVirtualEnvironment(folder: str) -> None:
+    """
+    Create the virtual environment if it does not exist yet.
+
+    Unlike ``InstallDependencies``, an existing venv is used as is, without
+    checking requirements.txt against the installed packages.
+
+    Parameters
+    ----------
+    folder : str
+        The folder where the venv should exist (relative path to source dir).
+    """
+    if os.path.exists(os.path.join(folder, "venv")):
+        return
+
+    InstallDependencies(folder)
+
+
 def SetupEnvironment(type: str, folder: str) -> None:
     """
     Setup the environment by copying the appropriate .env file.
@@ -228,6 +346,7 @@ def RunServer(type: str = "dev", **kwargs: Any) -> None:
 
 def RunTests(
     filter: str | None = None,
+    workers: str = "auto",
     **kwargs: Any,
 ) -> None:
     """
@@ -237,15 +356,97 @@ def RunTests(
     ----------
     filter : str
         A filter to select specific tests to run.
+    workers : str
+        The number of pytest-xdist workers, 'auto' for one per CPU or '0' to
+        run serially. Every worker gets its own temporary database.
     """
     SetupEnvironment("test", folder="ntt_server")
-    command = f"{PYTHON_EXECUTABLE} -m pytest"
+    command = f"{PYTHON_EXECUTABLE} -m pytest -n {workers}"
     if filter:
         command += f" -k {filter}"
 
     RunCommand(command, folder="ntt_server")
 
 
+def RunImportTimeReport(
+    type: str,
+    module: str,
+    top: int,
+    **kwargs: Any,
+) -> None:
+    """
+    Report the slowest imports of a module of the server.
+
+    Parameters
+    ----------
+    type : str
+        The environment type ('dev' or 'prod').
+    module : str
+        The module to import, relative to the server folder.
+    top : int
+        The number of imports to report, sorted by cumulative time.
+    """
+    SetupEnvironment(type, folder="ntt_server")
+
+    command = f'{PYTHON_EXECUTABLE} -X importtime -c "import {module}"'
+    logger.info(f"Running command: {command}")
+    result = subprocess.run(
+        command,
+        shell=True,
+        check=True,
+        cwd="ntt_server",
+        capture_output=True,
+        text=True,
+    )
+
+    imports: list[tuple[int, int, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+
+        selfTime, cumulativeTime, name = line[len("import time:") :].split("|")
+        imports.append((int(cumulativeTime), int(selfTime), name.strip()))
+
+    assert imports, f"No import time reported for module: {module}"
+
+    logger.info(f"Total import time of {module}: {imports[-1][0] / 1000:.1f} ms")
+    logger.info(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulativeTime, selfTime, name in sorted(imports, reverse=True)[:top]:
+        logger.info(
+            f"{cumulativeTime / 1000:>9.1f} ms {selfTime / 1000:>7.1f} ms  {name}"
+        )
+
+
+def RunBenchmarks(
+    type: str,
+    filter: str | None = None,
+    **kwargs: Any,
+) -> None:
+    """
+    Run the benchmark scripts of the server.
+
+    Parameters
+    ----------
+    type : str
+        The environment type ('dev' or 'prod').
+    filter : str | None
+        Only run the benchmarks whose file name contains this string.
+    """
+    SetupEnvironment(type, folder="ntt_server")
+
+    benchmarksFolder = os.path.join("ntt_server", "benchmarks")
+    for fileName in sorted(os.listdir(benchmarksFolder)):
+        if not fileName.startswith("bench_") or not fileName.endswith(".py"):
+            continue
+        if filter and filter not in fileName:
+            continue
+
+        RunCommand(
+            f"{PYTHON_EXECUTABLE} {os.path.join('benchmarks', fileName)}",
+            folder="ntt_server",
+        )
+
+
 def RunMigrations(
     action: str,
     type: str,
@@ -268,7 +469,7 @@ def RunMigrations(
     elif action == "down":
         command = f"{ALEMBIC_EXECUTABLE} downgrade -{rollback_count}"
     elif action == "status":
-        assert False
+        command = f"{PYTHON_EXECUTABLE} -m app.db.migration_status"
     else:
         command = f"{ALEMBIC_EXECUTABLE} revision --autogenerate -m 'auto update'"
 
@@ -277,6 +478,27 @@ def RunMigrations(
     RunCommand(command, folder="ntt_server")
 
 
+def RunShardRebalance(
+    type: str,
+    previous_count: int,
+    **kwargs: Any,
+) -> None:
+    """
+    Move the users to their owning shard after the shard count has grown.
+
+    Parameters
+    ----------
+    type : str
+        The environment type ('dev' or 'prod').
+    previous_count : int
+        The number of shards before the growth.
+    """
+    SetupEnvironment(type, folder="ntt_server")
+    command = f"{PYTHON_EXECUTABLE} -m app.db.sharding --previous-count {previous_count}"
+
+    RunCommand(command, folder="ntt_server")
+
+
 def CreateMigrationIfNeeded(
     type: str,
     **kwargs: Any,
@@ -1,19 +1,32 @@
 from config.args import ArgConfig
 from config.utils import (
+    EnsureVirtualEnvironment,
     InstallDependencies,
     InstallNewDependencies,
     RunServer,
     RunTests,
     RunMigrations,
+    RunShardRebalance,
+    RunImportTimeReport,
+    RunBenchmarks,
     CreateMigrationIfNeeded,
 )
 
 
+# commands that need the server dependencies installed and the models migrated
+SETUP_COMMANDS = ("run", "test", "migrate", "install")
+# commands that only need the venv python to exist
+VENV_COMMANDS = ("importtime", "bench", "rebalance")
+
+
 def main() -> None:
     arg_config = ArgConfig()
 
-    InstallDependencies("ntt_server")
-    CreateMigrationIfNeeded(**arg_config.ToDict())
+    if arg_config.Command in SETUP_COMMANDS:
+        InstallDependencies("ntt_server")
+        CreateMigrationIfNeeded(**arg_config.ToDict())
+    elif arg_config.Command in VENV_COMMANDS:
+        EnsureVirtualEnvironment("ntt_server")
 
     if arg_config.Command == "run":
         RunServer(**arg_config.ToDict())
@@ -23,6 +36,12 @@ def main() -> None:
         RunTests(**arg_config.ToDict())
     elif arg_config.Command == "migrate":
         RunMigrations(**arg_config.ToDict())
+    elif arg_config.Command == "importtime":
+        RunImportTimeReport(**arg_config.ToDict())
+    elif arg_config.Command == "bench":
+        RunBenchmarks(**arg_config.ToDict())
+    elif arg_config.Command == "rebalance":
+        RunShardRebalance(**arg_config.ToDict())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+import sys
+import time
+from contextlib import ExitStack
+from fastapi import APIRouter, FastAPI, HTTPException
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+from app.core import settings, logger
+from app.db.session import engine, shardEngines
+
+router = APIRouter(tags=["health"])
+
+
+class ReadinessState:
+    def __init__(self) -> None:
+        self.warmedUp = False
+        self.lastCheckAt = 0.0
+        self.lastCheckOk = False
+        self.warmUpFailed = False
+
+
+readiness = ReadinessState()
+
+
+def _Engines():
+    # with sharding on, DATABASE_URL is not used by the app
+    return list(shardEngines.values()) or [engine]
+
+
+def CheckDatabase(connectionCount: int = 1) -> bool:
+    """Run a trivial query on every database engine.
+
+    Parameters
+    ----------
+    connectionCount : int
+        The number of connections to open at once per engine, capped by the
+        pool size. Opening the whole pool fills it for the first requests.
+
+    Returns
+    -------
+    bool
+        True if every database answered, False otherwise.
+    """
+    try:
+        for dbEngine in _Engines():
+            poolSize = getattr(dbEngine.pool, "size", lambda: 1)()
+            with ExitStack() as stack:
+                for _ in range(min(connectionCount, poolSize)):
+                    connection = stack.enter_context(dbEngine.connect())
+                    connection.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.error(f"Database check failed: {e}")
+        return False
+
+    return True
+
+
+def WarmUp(app: FastAPI) -> None:
+    """Pay the cold start costs before the server reports itself ready.
+
+    A failed warm-up is logged and marks the process unhealthy: ``/healthz``
+    then answers 503 so the orchestrator restarts it, instead of ``/readyz``
+    staying at 503 forever.
+
+    Parameters
+    ----------
+    app : FastAPI
+        The application whose OpenAPI schema should be built.
+    """
+    from app.schemas import RegisterRequest, RegisterResponse, LoginResponse
+    from app.utils import HashPassword, VerifyPassword
+
+    startedAt = time.perf_counter()
+
+    try:
+        VerifyPassword("warm-up", HashPassword("warm-up"))
+
+        RegisterRequest(email="warm-up@example.com", password="warm-up")
+        RegisterResponse().model_dump_json()
+        LoginResponse(token="warm-up").model_dump_json()
+        app.openapi()
+    except Exception as e:
+        logger.exception(f"Warm-up failed: {e}")
+        readiness.warmUpFailed = True
+        return
+
+    readiness.lastCheckOk = CheckDatabase(connectionCount=sys.maxsize)
+    readiness.lastCheckAt = time.monotonic()
+    readiness.warmedUp = True
+
+    logger.info(f"Warm-up completed in {time.perf_counter() - startedAt:.3f}s")
+
+
+@router.get("/healthz")
+async def Liveness() -> dict[str, str]:
+    if readiness.warmUpFailed:
+        raise HTTPException(status_code=503, detail="Warm-up failed")
+
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+async def Readiness() -> dict[str, str]:
+    if readiness.warmUpFailed:
+        raise HTTPException(status_code=503, detail="Warm-up failed")
+
+    if not readiness.warmedUp:
+        raise HTTPException(status_code=503, detail="Warming up")
+
+    if time.monotonic() - readiness.lastCheckAt > settings.READINESS_CACHE_SECONDS:
+        readiness.lastCheckOk = await run_in_threadpool(CheckDatabase)
+        readiness.lastCheckAt = time.monotonic()
+
+    if not readiness.lastCheckOk:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    return {"status": "ready"}
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse
 from app.models import User
 from app.schemas import RegisterRequest, RegisterResponse
 from app.db.session import GetDBSession, Session
 from app.schemas.user import LoginRequest, LoginResponse
-from app.utils import GenerateID, HashPassword, VerifyPassword
+from app.utils import GenerateID, HashPassword, VerifyPassword, TrustedResponse
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -15,8 +16,39 @@ router = APIRouter(prefix="/users", tags=["users"])
 )
 async def RegisterUser(
     request: RegisterRequest,
+    idempotencyKey: str | None = Header(default=None, alias="Idempotency-Key"),
     db: Session = Depends(GetDBSession),
 ) -> RegisterResponse:
+    if idempotencyKey is None:
+        return TrustedResponse(_CreateUser(request, db), 201)
+
+    from app.core.idempotency import idempotencyStore, Fingerprint
+
+    fingerprint = Fingerprint(request.email, request.password)
+    storedResponse = await idempotencyStore.Begin(idempotencyKey, fingerprint)
+    if storedResponse is not None:
+        statusCode, body = storedResponse
+        return JSONResponse(status_code=statusCode, content=body)  # type: ignore
+
+    try:
+        response = _CreateUser(request, db)
+    except HTTPException as e:
+        await idempotencyStore.Complete(
+            idempotencyKey, fingerprint, e.status_code, {"detail": e.detail}
+        )
+        raise
+    except BaseException:
+        # also on cancellation, so a retry does not wait for a dead attempt
+        await idempotencyStore.Abandon(idempotencyKey)
+        raise
+
+    await idempotencyStore.Complete(
+        idempotencyKey, fingerprint, 201, response.model_dump(mode="json")
+    )
+    return TrustedResponse(response, 201)
+
+
+def _CreateUser(request: RegisterRequest, db: Session) -> RegisterResponse:
     user = User(
         id=GenerateID(),
         email=request.email,
@@ -38,11 +70,15 @@ async def LoginUser(
     request: LoginRequest,
     db: Session = Depends(GetDBSession),
 ) -> LoginResponse:
+    from app.core.audit import auditPipeline, CreateAuthEvent, LOGIN_FAILURE, LOGIN_SUCCESS
 
     user = db.query(User).filter(User.email == request.email).first()
     if not user or not VerifyPassword(request.password, user.hashed_password):
+        await auditPipeline.Record(CreateAuthEvent(LOGIN_FAILURE, request.email))
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    await auditPipeline.Record(CreateAuthEvent(LOGIN_SUCCESS, request.email, user.id))
+
     token = "dummy_token"  # Replace with actual token generation logic
 
-    return LoginResponse(token=token)
+    return TrustedResponse(LoginResponse(token=token), 200)
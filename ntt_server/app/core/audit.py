@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any
+from sqlalchemy import bindparam, insert, update
+from starlette.concurrency import run_in_threadpool
+from .setting import settings
+from .logger import logger
+
+
+LOGIN_SUCCESS = "login_success"
+LOGIN_FAILURE = "login_failure"
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+
+def CreateAuthEvent(eventType: str, email: str, userId: str | None = None) -> dict[str, Any]:
+    from app.utils import GenerateID
+
+    return {
+        "id": GenerateID(),
+        "user_id": userId,
+        "email": email,
+        "event_type": eventType,
+        "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+    }
+
+
+class AuditPipeline:
+    """Write-behind pipeline for the authentication audit events.
+
+    The routes only enqueue the events, a background task writes them in
+    batches to the ``auth_events`` table and/or to an append-only NDJSON file
+    once ``batchSize`` events are queued or ``flushInterval`` seconds passed.
+    Successful logins also update ``users.last_login_at`` in the same batch.
+    """
+
+    def __init__(
+        self,
+        queueSize: int,
+        batchSize: int,
+        flushInterval: float,
+        overflow: str,
+        useDatabase: bool,
+        filePath: str | None = None,
+    ) -> None:
+        assert overflow in OVERFLOW_POLICIES, (
+            f"Invalid audit overflow policy. Use one of {', '.join(OVERFLOW_POLICIES)}."
+        )
+
+        self._queueSize = queueSize
+        self._batchSize = batchSize
+        self._flushInterval = flushInterval
+        self._overflow = overflow
+        self._useDatabase = useDatabase
+        self._filePath = filePath
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self.droppedCount = 0
+
+    async def Start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self._queueSize)
+        self._task = asyncio.create_task(self._Run(self._queue))
+
+    async def Stop(self) -> None:
+        """Flush every queued event and stop the background task."""
+        if self._queue is None or self._task is None:
+            return
+
+        queue, self._queue = self._queue, None
+        await queue.put(None)
+        await self._task
+        self._task = None
+
+        if self.droppedCount:
+            logger.warning(f"{self.droppedCount} audit events were dropped.")
+
+    async def Record(self, event: dict[str, Any]) -> None:
+        queue = self._queue
+        if queue is None:
+            self.droppedCount += 1
+            return
+
+        if self._overflow == "block":
+            await queue.put(event)
+            return
+
+        if queue.full():
+            self.droppedCount += 1
+            if self._overflow == "drop_newest":
+                return
+            queue.get_nowait()
+
+        queue.put_nowait(event)
+
+    async def _Run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+
+            batch = [event]
+            stopping = False
+            deadline = loop.time() + self._flushInterval
+
+            while len(batch) < self._batchSize:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            try:
+                await run_in_threadpool(self._WriteBatch, batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} audit events: {e}")
+
+            if stopping:
+                return
+
+    def _WriteBatch(self, batch: list[dict[str, Any]]) -> None:
+        if self._useDatabase:
+            self._WriteDatabase(batch)
+        if self._filePath:
+            self._WriteFile(batch)
+
+    def _WriteDatabase(self, batch: list[dict[str, Any]]) -> None:
+        from app.db.session import engine, shardEngines
+        from app.db.sharding import ShardForEmail
+        from app.models import AuthEvent, User
+
+        groups: dict[Any, list[dict[str, Any]]] = {}
+        for event in batch:
+            if shardEngines:
+                shardId = str(ShardForEmail(event["email"], len(shardEngines)))
+                groups.setdefault(shardEngines[shardId], []).append(event)
+            else:
+                groups.setdefault(engine, []).append(event)
+
+        for dbEngine, events in groups.items():
+            logins = [
+                {"login_user_id": event["user_id"], "login_at": event["created_at"]}
+                for event in events
+                if event["event_type"] == LOGIN_SUCCESS and event["user_id"]
+            ]
+
+            with dbEngine.begin() as connection:
+                connection.execute(insert(AuthEvent.__table__), events)
+
+                if logins:
+                    connection.execute(
+                        update(User.__table__)
+                        .where(User.__table__.c.id == bindparam("login_user_id"))
+                        .values(last_login_at=bindparam("login_at")),
+                        logins,
+                    )
+
+    def _WriteFile(self, batch: list[dict[str, Any]]) -> None:
+        assert self._filePath is not None
+
+        folder = os.path.dirname(self._filePath)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with open(self._filePath, "a", encoding="utf-8") as f:
+            for event in batch:
+                f.write(
+                    json.dumps({**event, "created_at": event["created_at"].isoformat()})
+                )
+                f.write("\n")
+
+
+auditPipeline = AuditPipeline(
+    queueSize=settings.AUDIT_QUEUE_SIZE,
+    batchSize=settings.AUDIT_BATCH_SIZE,
+    flushInterval=settings.AUDIT_FLUSH_SECONDS,
+    overflow=settings.AUDIT_OVERFLOW,
+    useDatabase=settings.AUDIT_USE_DATABASE,
+    filePath=settings.AUDIT_LOG_FILE or None,
+)
@@ -0,0 +1,269 @@
+import asyncio
+import hmac
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from .setting import settings
+
+
+IDEMPOTENCY_BACKENDS = ("memory", "database")
+DATABASE_POLL_INTERVAL = 0.05
+
+StoredResponse = tuple[int, Any]
+
+
+def Fingerprint(*parts: str) -> str:
+    """Hash the request fields that must match when a key is reused.
+
+    The hash is keyed with ``SECRET_KEY``, so the stored fingerprints cannot
+    be brute forced back to the request fields (such as a password).
+    """
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"),
+        "\0".join(parts).encode("utf-8"),
+        "sha256",
+    ).hexdigest()
+
+
+def _CheckFingerprint(expected: str, fingerprint: str) -> None:
+    if expected != fingerprint:
+        raise HTTPException(
+            status_code=422,
+            detail="Idempotency-Key was already used with a different request",
+        )
+
+
+def _InProgressError() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail="A request with this Idempotency-Key is still in progress",
+    )
+
+
+class MemoryIdempotencyStore:
+    """Per-process idempotency store, bounded by size and age.
+
+    A duplicate arriving while the original attempt is still running waits
+    for it, up to ``waitTimeout`` seconds, instead of running the request again.
+    """
+
+    def __init__(self, maxEntries: int, ttl: float, waitTimeout: float) -> None:
+        self._maxEntries = maxEntries
+        self._ttl = ttl
+        self._waitTimeout = waitTimeout
+        self._entries: OrderedDict[str, tuple[float, str, StoredResponse]] = (
+            OrderedDict()
+        )
+        self._pending: dict[str, tuple[str, asyncio.Future]] = {}
+
+    async def Begin(self, key: str, fingerprint: str) -> StoredResponse | None:
+        """Claim the key, or get the response stored for it.
+
+        Returns
+        -------
+        StoredResponse | None
+            The stored status code and body, None if the caller claimed the
+            key and must call ``Complete`` or ``Abandon``.
+        """
+        deadline = time.monotonic() + self._waitTimeout
+
+        while True:
+            self._Evict()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                _, expected, response = entry
+                _CheckFingerprint(expected, fingerprint)
+                return response
+
+            pending = self._pending.get(key)
+            if pending is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[key] = (fingerprint, future)
+                return None
+
+            _CheckFingerprint(pending[0], fingerprint)
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(pending[1]), deadline - time.monotonic()
+                )
+            except asyncio.TimeoutError:
+                raise _InProgressError()
+
+    async def Complete(
+        self,
+        key: str,
+        fingerprint: str,
+        statusCode: int,
+        body: Any,
+    ) -> None:
+        self._entries[key] = (time.monotonic(), fingerprint, (statusCode, body))
+        self._entries.move_to_end(key)
+        self._Evict()
+        self._Release(key)
+
+    async def Abandon(self, key: str) -> None:
+        self._Release(key)
+
+    def _Release(self, key: str) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is not None and not pending[1].done():
+            pending[1].set_result(None)
+
+    def _Evict(self) -> None:
+        expiredBefore = time.monotonic() - self._ttl
+        while self._entries:
+            oldestKey, (storedAt, _, _) = next(iter(self._entries.items()))
+            if storedAt >= expiredBefore and len(self._entries) <= self._maxEntries:
+                return
+            del self._entries[oldestKey]
+
+
+class DatabaseIdempotencyStore:
+    """Idempotency store shared by every worker through the database.
+
+    The key is claimed by inserting a pending row, so concurrent duplicates
+    in other workers poll the row until the original attempt completes. A
+    pending row older than ``waitTimeout`` is a lease whose owner died, and
+    is taken over by the next attempt.
+    """
+
+    def __init__(self, ttl: float, waitTimeout: float) -> None:
+        self._ttl = ttl
+        self._waitTimeout = waitTimeout
+
+    async def Begin(self, key: str, fingerprint: str) -> StoredResponse | None:
+        deadline = time.monotonic() + self._waitTimeout
+
+        while True:
+            claimed, expected, response = await run_in_threadpool(
+                self._Claim, key, fingerprint
+            )
+            if claimed:
+                return None
+
+            _CheckFingerprint(expected, fingerprint)
+            if response is not None:
+                return response
+
+            if time.monotonic() > deadline:
+                raise _InProgressError()
+            await asyncio.sleep(DATABASE_POLL_INTERVAL)
+
+    async def Complete(
+        self,
+        key: str,
+        fingerprint: str,
+        statusCode: int,
+        body: Any,
+    ) -> None:
+        await run_in_threadpool(self._Store, key, statusCode, body)
+
+    async def Abandon(self, key: str) -> None:
+        await run_in_threadpool(self._Delete, key)
+
+    def _Now(self) -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def _Claim(self, key: str, fingerprint: str):
+        from app.db.session import primaryEngine
+        from app.models import IdempotencyKey
+
+        table = IdempotencyKey.__table__
+        now = self._Now()
+
+        with primaryEngine.begin() as connection:
+            connection.execute(
+                delete(table).where(
+                    table.c.key == key,
+                    or_(
+                        table.c.created_at < now - timedelta(seconds=self._ttl),
+                        and_(
+                            table.c.status_code.is_(None),
+                            table.c.created_at
+                            < now - timedelta(seconds=self._waitTimeout),
+                        ),
+                    ),
+                )
+            )
+            row = connection.execute(select(table).where(table.c.key == key)).first()
+
+        if row is not None:
+            response = None
+            if row.status_code is not None:
+                response = (row.status_code, json.loads(row.response_body))
+            return False, row.fingerprint, response
+
+        try:
+            with primaryEngine.begin() as connection:
+                connection.execute(
+                    insert(table).values(
+                        key=key,
+                        fingerprint=fingerprint,
+                        created_at=now,
+                    )
+                )
+        except IntegrityError:
+            return False, fingerprint, None
+
+        return True, fingerprint, None
+
+    def _Store(self, key: str, statusCode: int, body: Any) -> None:
+        from app.db.session import primaryEngine
+        from app.models import IdempotencyKey
+
+        table = IdempotencyKey.__table__
+        now = self._Now()
+
+        with primaryEngine.begin() as connection:
+            connection.execute(
+                update(table)
+                .where(table.c.key == key)
+                .values(status_code=statusCode, response_body=json.dumps(body))
+            )
+            connection.execute(
+                delete(table).where(
+                    table.c.created_at < now - timedelta(seconds=self._ttl)
+                )
+            )
+
+    def _Delete(self, key: str) -> None:
+        from app.db.session import primaryEngine
+        from app.models import IdempotencyKey
+
+        table = IdempotencyKey.__table__
+
+        with primaryEngine.begin() as connection:
+            connection.execute(
+                delete(table).where(
+                    table.c.key == key,
+                    table.c.status_code.is_(None),
+                )
+            )
+
+
+def CreateIdempotencyStore() -> MemoryIdempotencyStore | DatabaseIdempotencyStore:
+    assert settings.IDEMPOTENCY_BACKEND in IDEMPOTENCY_BACKENDS, (
+        f"Invalid idempotency backend. Use one of {', '.join(IDEMPOTENCY_BACKENDS)}."
+    )
+
+    if settings.IDEMPOTENCY_BACKEND == "database":
+        return DatabaseIdempotencyStore(
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+            waitTimeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+        )
+
+    return MemoryIdempotencyStore(
+        maxEntries=settings.IDEMPOTENCY_MAX_ENTRIES,
+        ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        waitTimeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+    )
+
+
+idempotencyStore = CreateIdempotencyStore()
@@ -0,0 +1,172 @@
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from .logger import logger
+
+
+WORKER_RESTART_DELAY = 1.0
+SUPERVISOR_POLL_INTERVAL = 0.5
+MAX_BOOT_FAILURES = 5
+
+# same exit code as uvicorn's own CLI when the lifespan startup fails
+STARTUP_FAILURE = 3
+
+
+def ResolveWorkerCount(workers: int) -> int:
+    """Get the number of worker processes to start.
+
+    Parameters
+    ----------
+    workers : int
+        The configured number of workers, 0 or less means one per usable CPU.
+
+    Returns
+    -------
+    int
+        The number of workers, at least 1.
+    """
+    if workers > 0:
+        return workers
+
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+
+    return os.cpu_count() or 1
+
+
+class PreforkSupervisor:
+    """Run uvicorn workers forked from a parent that already imported the app.
+
+    The app is loaded once before forking, so the workers share its memory
+    copy-on-write. Crashed workers are restarted, and SIGTERM/SIGINT are
+    forwarded to the workers so they drain their requests before exiting.
+    After ``MAX_BOOT_FAILURES`` workers in a row fail to start, the
+    supervisor gives up and exits with ``STARTUP_FAILURE``.
+    """
+
+    def __init__(self, config: uvicorn.Config, workerCount: int) -> None:
+        self._config = config
+        self._workerCount = workerCount
+        self._workers: dict[int, float] = {}
+        self._shouldExit = False
+        self._bootFailures = 0
+
+    def Run(self) -> None:
+        self._config.load()
+        sock = self._config.bind_socket()
+
+        signal.signal(signal.SIGTERM, self._HandleExit)
+        signal.signal(signal.SIGINT, self._HandleExit)
+
+        logger.info(f"Starting {self._workerCount} workers from [{os.getpid()}]")
+        for _ in range(self._workerCount):
+            self._SpawnWorker(sock)
+
+        while not self._shouldExit:
+            self._ReapWorkers(sock)
+            time.sleep(SUPERVISOR_POLL_INTERVAL)
+
+        self._Shutdown()
+        sock.close()
+
+        if self._bootFailures >= MAX_BOOT_FAILURES:
+            sys.exit(STARTUP_FAILURE)
+
+    def _HandleExit(self, sig: int, frame: object) -> None:
+        self._shouldExit = True
+
+    def _SpawnWorker(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid != 0:
+            self._workers[pid] = time.monotonic()
+            return
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        exitCode = 0
+        try:
+            server = uvicorn.Server(self._config)
+            server.run(sockets=[sock])
+            if not server.started:
+                exitCode = STARTUP_FAILURE
+        except BaseException as e:
+            logger.error(f"Worker [{os.getpid()}] crashed: {e}")
+            exitCode = 1
+        finally:
+            os._exit(exitCode)
+
+    def _ReapWorkers(self, sock: socket.socket) -> None:
+        while self._workers:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+
+            startedAt = self._workers.pop(pid, None)
+            if startedAt is None or self._shouldExit:
+                continue
+
+            exitCode = os.waitstatus_to_exitcode(status)
+            if exitCode == STARTUP_FAILURE:
+                self._bootFailures += 1
+            else:
+                self._bootFailures = 0
+
+            if self._bootFailures >= MAX_BOOT_FAILURES:
+                logger.error(
+                    f"{self._bootFailures} workers in a row failed to start, stopping..."
+                )
+                self._shouldExit = True
+                return
+
+            logger.warning(f"Worker [{pid}] exited with status {exitCode}, restarting...")
+            if time.monotonic() - startedAt < WORKER_RESTART_DELAY:
+                time.sleep(WORKER_RESTART_DELAY)
+            self._SpawnWorker(sock)
+
+    def _Shutdown(self) -> None:
+        logger.info(f"Draining {len(self._workers)} workers...")
+        for pid in self._workers:
+            os.kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + (self._config.timeout_graceful_shutdown or 0) + 5
+        while self._workers and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.1)
+            else:
+                self._workers.pop(pid, None)
+
+        for pid in self._workers:
+            logger.warning(f"Worker [{pid}] did not drain in time, killing it...")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+
+def RunProductionServer(config: uvicorn.Config, workers: int) -> None:
+    """Run the server with several worker processes.
+
+    Parameters
+    ----------
+    config : uvicorn.Config
+        The server configuration, its app should be an import string.
+    workers : int
+        The configured number of workers, 0 or less means one per usable CPU.
+    """
+    workerCount = ResolveWorkerCount(workers)
+
+    if not hasattr(os, "fork"):
+        # no fork on Windows, let uvicorn spawn workers that import the app
+        from uvicorn.supervisors import Multiprocess
+
+        config.workers = workerCount
+        sock = config.bind_socket()
+        Multiprocess(config, target=uvicorn.Server(config).run, sockets=[sock]).run()
+        return
+
+    PreforkSupervisor(config, workerCount).Run()
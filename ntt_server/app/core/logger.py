@@ -1,4 +1,5 @@
 import logging
+import os
 from colorlog import ColoredFormatter
 
 
@@ -22,7 +23,7 @@ logger.addHandler(consoleHandler)
 
 
 def RegisterFileLogger(fileName: str) -> None:
-    """Create a file logger.
+    """Create a file logger, once per file.
 
     Parameters
     ----------
@@ -30,6 +31,11 @@ def RegisterFileLogger(fileName: str) -> None:
         The name of the log file.
     """
 
+    filePath = os.path.abspath(fileName)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == filePath:
+            return
+
     fileHandler = logging.FileHandler(fileName)
     fileHandler.setFormatter(formatter)
     logger.addHandler(fileHandler)
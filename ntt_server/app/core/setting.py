@@ -10,6 +10,25 @@ class ServerSettings(BaseSettings):
     MODE: str
     HOST: str
     PORT: int
+    DATABASE_SHARD_URLS: str = ""
+    WORKERS: int = 0
+    BACKLOG: int = 2048
+    TIMEOUT_KEEP_ALIVE: int = 5
+    LIMIT_CONCURRENCY: int | None = None
+    READINESS_CACHE_SECONDS: float = 5.0
+    LOG_VERBOSE: bool = False
+    USE_LOG_FILE: bool = False
+    AUDIT_USE_DATABASE: bool = True
+    AUDIT_LOG_FILE: str = ""
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_SECONDS: float = 1.0
+    AUDIT_OVERFLOW: str = "drop_oldest"
+    IDEMPOTENCY_BACKEND: str = "memory"
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0
+    FAST_JSON_RESPONSES: bool = False
 
     class Config:
         env_file = ".env"
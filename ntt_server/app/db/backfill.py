@@ -0,0 +1,219 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence
+from sqlalchemy import Column, Table, func, insert, select, update
+from sqlalchemy.engine import Connection, Engine, Row
+
+
+BACKFILL_BATCH_SIZE = 1000
+BACKFILL_PAUSE_SECONDS = 0.05
+
+# the key types whose values round-trip through the ``last_key`` text column
+KEY_TYPES = (str, int)
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+
+backfillLogger = logging.getLogger("alembic.backfill")
+
+ApplyChunk = Callable[[Connection, Sequence[Row]], None]
+
+
+def _Now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Backfill:
+    """Process a table in keyset ordered chunks, one transaction per chunk.
+
+    Every chunk commits together with its checkpoint in ``backfill_checkpoints``,
+    so an interrupted backfill resumes after the last committed chunk, and the
+    server only ever waits for one short transaction.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        name: str,
+        table: Table,
+        keyColumn: Column,
+        apply: ApplyChunk,
+        batchSize: int = BACKFILL_BATCH_SIZE,
+        pause: float = BACKFILL_PAUSE_SECONDS,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        engine : Engine
+            The engine used to open one connection per chunk.
+        name : str
+            The unique name of the backfill, used as its checkpoint key.
+        table : Table
+            The table to walk through.
+        keyColumn : Column
+            A unique, indexed String or Integer column of ``table`` ordering
+            the chunks.
+        apply : ApplyChunk
+            Called with the chunk connection and rows, writes the changes.
+        batchSize : int
+            The number of rows per chunk.
+        pause : float
+            Seconds to sleep between chunks, leaving room to the server.
+        """
+        try:
+            keyType = keyColumn.type.python_type
+        except NotImplementedError:
+            keyType = None
+        assert keyType in KEY_TYPES, (
+            f"Invalid backfill key column {keyColumn.name}. Use a String or Integer column."
+        )
+
+        self._engine = engine
+        self._name = name
+        self._table = table
+        self._keyColumn = keyColumn
+        self._apply = apply
+        self._batchSize = batchSize
+        self._pause = pause
+
+    def Run(self) -> int:
+        """Run the backfill from its last checkpoint until the end of the table.
+
+        Returns
+        -------
+        int
+            The total number of processed rows, including earlier runs.
+        """
+        from app.models import BackfillCheckpoint
+
+        checkpoints = BackfillCheckpoint.__table__
+        checkpoint = self._LoadCheckpoint(checkpoints)
+
+        if checkpoint.status == STATUS_DONE:
+            backfillLogger.info(f"Backfill {self._name} already done.")
+            return checkpoint.processed_count
+
+        lastKey = self._ParseKey(checkpoint.last_key)
+        processedCount = checkpoint.processed_count
+        totalCount = checkpoint.total_count
+        startedAt = time.monotonic()
+        startedCount = processedCount
+
+        while True:
+            with self._engine.begin() as connection:
+                query = select(self._table).order_by(self._keyColumn)
+                if lastKey is not None:
+                    query = query.where(self._keyColumn > lastKey)
+                rows = connection.execute(query.limit(self._batchSize)).all()
+
+                if rows:
+                    self._apply(connection, rows)
+                    lastKey = getattr(rows[-1], self._keyColumn.name)
+                    processedCount += len(rows)
+
+                connection.execute(
+                    update(checkpoints)
+                    .where(checkpoints.c.name == self._name)
+                    .values(
+                        last_key=None if lastKey is None else str(lastKey),
+                        processed_count=processedCount,
+                        status=STATUS_RUNNING if rows else STATUS_DONE,
+                        updated_at=_Now(),
+                    )
+                )
+
+            if not rows:
+                break
+
+            elapsed = max(time.monotonic() - startedAt, 1e-9)
+            backfillLogger.info(
+                f"Backfill {self._name}: {processedCount}/{totalCount} rows"
+                f" ({(processedCount - startedCount) / elapsed:.0f} rows/s)"
+            )
+            time.sleep(self._pause)
+
+        backfillLogger.info(f"Backfill {self._name} done, {processedCount} rows.")
+        return processedCount
+
+    def _LoadCheckpoint(self, checkpoints: Table) -> Row:
+        with self._engine.begin() as connection:
+            checkpoint = connection.execute(
+                select(checkpoints).where(checkpoints.c.name == self._name)
+            ).first()
+
+            if checkpoint is None:
+                totalCount = connection.execute(
+                    select(func.count()).select_from(self._table)
+                ).scalar_one()
+                connection.execute(
+                    insert(checkpoints).values(
+                        name=self._name,
+                        table_name=self._table.name,
+                        processed_count=0,
+                        total_count=totalCount,
+                        status=STATUS_RUNNING,
+                        started_at=_Now(),
+                        updated_at=_Now(),
+                    )
+                )
+                checkpoint = connection.execute(
+                    select(checkpoints).where(checkpoints.c.name == self._name)
+                ).one()
+
+        return checkpoint
+
+    def _ParseKey(self, value: str | None) -> Any:
+        if value is None:
+            return None
+        return self._keyColumn.type.python_type(value)
+
+
+def RunOnlineBackfill(
+    name: str,
+    table: Table,
+    keyColumn: Column,
+    apply: ApplyChunk,
+    batchSize: int = BACKFILL_BATCH_SIZE,
+    pause: float = BACKFILL_PAUSE_SECONDS,
+) -> int:
+    """Run a backfill from an Alembic revision without one long transaction.
+
+    The migration transaction is committed first, then the chunks run in
+    their own short transactions. Keep the backfill in a revision of its own
+    (after the revision changing the schema), so re-running ``migrate up``
+    after an interruption resumes it from its checkpoint.
+
+    Parameters
+    ----------
+    name : str
+        The unique name of the backfill.
+    table : Table
+        The table to walk through.
+    keyColumn : Column
+        A unique, indexed String or Integer column of ``table`` ordering the
+        chunks.
+    apply : ApplyChunk
+        Called with the chunk connection and rows, writes the changes.
+    batchSize : int
+        The number of rows per chunk.
+    pause : float
+        Seconds to sleep between chunks.
+
+    Returns
+    -------
+    int
+        The total number of processed rows.
+    """
+    from alembic import op
+
+    with op.get_context().autocommit_block():
+        return Backfill(
+            op.get_bind().engine,
+            name,
+            table,
+            keyColumn,
+            apply,
+            batchSize=batchSize,
+            pause=pause,
+        ).Run()
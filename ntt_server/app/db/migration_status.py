@@ -0,0 +1,81 @@
+import logging
+from typing import Any
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+
+def GetMigrationStatus(engine: Engine, scriptLocation: str) -> dict[str, Any]:
+    """Get the pending revisions and the backfills of a database.
+
+    Parameters
+    ----------
+    engine : Engine
+        The database to inspect.
+    scriptLocation : str
+        The folder of the Alembic scripts.
+
+    Returns
+    -------
+    dict[str, Any]
+        ``current`` revisions, ``pending`` revisions (oldest first) and the
+        ``backfills`` checkpoint rows.
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from app.models import BackfillCheckpoint
+
+    script = ScriptDirectory(scriptLocation)
+
+    with engine.connect() as connection:
+        current = MigrationContext.configure(connection).get_current_heads()
+
+        backfills = []
+        if engine.dialect.has_table(connection, BackfillCheckpoint.__tablename__):
+            backfills = connection.execute(
+                select(BackfillCheckpoint.__table__).order_by(
+                    BackfillCheckpoint.__table__.c.started_at
+                )
+            ).all()
+
+    pending = [
+        revision.revision
+        for revision in script.iterate_revisions("heads", current or "base")
+        if revision.revision not in current
+    ]
+    pending.reverse()
+
+    return {"current": list(current), "pending": pending, "backfills": backfills}
+
+
+def main() -> None:
+    import os
+    from app.core import logger
+    from app.db.session import engine, shardEngines
+
+    logger.setLevel(logging.INFO)
+
+    scriptLocation = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "migrations",
+    )
+    databases = {f"shard {name}": shardEngine for name, shardEngine in shardEngines.items()}
+    if not databases:
+        databases = {"main": engine}
+
+    for name, dbEngine in databases.items():
+        status = GetMigrationStatus(dbEngine, scriptLocation)
+
+        logger.info(f"Database {name}:")
+        logger.info(f"  current revision: {', '.join(status['current']) or 'none'}")
+        logger.info(f"  pending revisions: {', '.join(status['pending']) or 'none'}")
+
+        for backfill in status["backfills"]:
+            logger.info(
+                f"  backfill {backfill.name} on {backfill.table_name}: {backfill.status},"
+                f" {backfill.processed_count}/{backfill.total_count} rows,"
+                f" updated at {backfill.updated_at}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,24 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# the sharding helpers are only imported when sharding is configured
+shardURLs: list[str] = []
+if settings.DATABASE_SHARD_URLS:
+    from .sharding import ParseShardURLs
+
+    shardURLs = ParseShardURLs(settings.DATABASE_SHARD_URLS)
+
+if shardURLs:
+    from .sharding import CreateShardEngines, CreateShardedSessionMaker
+
+    shardEngines = CreateShardEngines(shardURLs)
+    SessionLocal = CreateShardedSessionMaker(shardEngines)
+else:
+    shardEngines = {}
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# the tables that are not sharded live on the first shard
+primaryEngine = shardEngines["0"] if shardEngines else engine
 
 
 def GetDBSession():
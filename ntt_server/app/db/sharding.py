@@ -0,0 +1,390 @@
+import hashlib
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import Column, BinaryExpression, BindParameter, Table, create_engine
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.orm import Mapper, ORMExecuteState, sessionmaker
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BooleanClauseList, Grouping
+
+
+SHARD_KEY_COLUMN = "email"
+REBALANCE_BATCH_SIZE = 500
+
+
+def ParseShardURLs(value: str | None) -> list[str]:
+    """Parse the comma separated list of shard database URLs.
+
+    Parameters
+    ----------
+    value : str | None
+        The raw ``DATABASE_SHARD_URLS`` setting.
+
+    Returns
+    -------
+    list[str]
+        The shard URLs in shard order, empty when sharding is disabled.
+    """
+    if not value:
+        return []
+
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def NormalizeEmail(email: str) -> str:
+    return email.strip().lower()
+
+
+def JumpHash(key: int, bucketCount: int) -> int:
+    """Jump consistent hash (Lamping & Veach).
+
+    Growing ``bucketCount`` from N to N + 1 only moves ~1/(N + 1) of the keys,
+    and every moved key lands in the new bucket.
+
+    Parameters
+    ----------
+    key : int
+        A 64-bit key.
+    bucketCount : int
+        The number of buckets, must be positive.
+
+    Returns
+    -------
+    int
+        The bucket index in ``[0, bucketCount)``.
+    """
+    assert bucketCount > 0, "The bucket count must be positive."
+
+    bucket, jump = -1, 0
+    while jump < bucketCount:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+
+    return bucket
+
+
+def ShardForEmail(email: str, shardCount: int) -> int:
+    """Get the shard index that owns the given email.
+
+    Parameters
+    ----------
+    email : str
+        The user email, normalized before hashing.
+    shardCount : int
+        The number of configured shards.
+
+    Returns
+    -------
+    int
+        The index of the owning shard.
+    """
+    digest = hashlib.sha256(NormalizeEmail(email).encode("utf-8")).digest()
+    return JumpHash(int.from_bytes(digest[:8], "big"), shardCount)
+
+
+def CreateShardEngines(shardURLs: list[str]) -> dict[str, Engine]:
+    return {
+        str(index): create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+        )
+        for index, url in enumerate(shardURLs)
+    }
+
+
+def _Conjuncts(clause: Any) -> list[Any]:
+    """Split a WHERE clause on its top-level ``AND``."""
+    while isinstance(clause, Grouping):
+        clause = clause.element
+
+    if isinstance(clause, BooleanClauseList) and clause.operator is operators.and_:
+        return [part for element in clause.clauses for part in _Conjuncts(element)]
+
+    return [clause]
+
+
+def _FindShardKeys(statement: Any) -> list[str]:
+    """Collect the values compared with ``==`` against the shard key column.
+
+    Only the top-level ``AND`` parts of the WHERE clause are used: a shard key
+    comparison under an ``OR`` or a ``NOT`` does not bound the matching rows
+    to one shard, so it yields no key and the query goes to every shard.
+    """
+    whereClause = getattr(statement, "whereclause", None)
+    if whereClause is None:
+        return []
+
+    keys: list[str] = []
+    for element in _Conjuncts(whereClause):
+        if not isinstance(element, BinaryExpression):
+            continue
+        if element.operator is not operators.eq:
+            continue
+
+        column, parameter = element.left, element.right
+        if isinstance(column, BindParameter):
+            column, parameter = parameter, column
+
+        if (
+            isinstance(column, Column)
+            and column.name == SHARD_KEY_COLUMN
+            and isinstance(parameter, BindParameter)
+            and isinstance(parameter.effective_value, str)
+        ):
+            keys.append(parameter.effective_value)
+
+    return keys
+
+
+def CreateShardedSessionMaker(shardEngines: dict[str, Engine]) -> sessionmaker:
+    """Create a session factory that routes rows by their email.
+
+    Rows carrying an ``email`` attribute are written to the shard returned by
+    ``ShardForEmail``, and queries whose WHERE clause is ``AND``-ed with an
+    ``email ==`` comparison only hit that shard. Everything else falls back to the first shard for writes and to
+    every shard for reads.
+
+    Parameters
+    ----------
+    shardEngines : dict[str, Engine]
+        The shard engines keyed by their shard index.
+
+    Returns
+    -------
+    sessionmaker
+        The session factory producing ``ShardedSession`` instances.
+    """
+    from sqlalchemy.ext.horizontal_shard import ShardedSession
+
+    shardIds = list(shardEngines.keys())
+
+    def ShardChooser(mapper: Mapper | None, instance: Any, clause: Any = None):
+        email = getattr(instance, SHARD_KEY_COLUMN, None)
+        if isinstance(email, str):
+            return shardIds[ShardForEmail(email, len(shardIds))]
+        return shardIds[0]
+
+    def IdentityChooser(mapper: Mapper, primaryKey: Any, **kwargs: Any):
+        return shardIds
+
+    def ExecuteChooser(context: ORMExecuteState) -> Iterable[str]:
+        keys = _FindShardKeys(context.statement)
+        if not keys:
+            return shardIds
+        return sorted({shardIds[ShardForEmail(key, len(shardIds))] for key in keys})
+
+    return sessionmaker(
+        class_=ShardedSession,
+        autocommit=False,
+        autoflush=False,
+        shards=shardEngines,
+        shard_chooser=ShardChooser,
+        identity_chooser=IdentityChooser,
+        execute_chooser=ExecuteChooser,
+    )
+
+
+def _IterateBatches(engine: Engine, table: Table, batchSize: int) -> Iterator[list[Row]]:
+    """Walk a table in ``id`` ordered batches, each read in its own connection."""
+    lastId = ""
+
+    while True:
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(table)
+                .where(table.c.id > lastId)
+                .order_by(table.c.id)
+                .limit(batchSize)
+            ).all()
+
+        if not rows:
+            return
+        lastId = rows[-1].id
+        yield rows
+
+
+def _GroupMoves(
+    rows: list[Row], sourceIndex: int, shardCount: int
+) -> dict[int, list[dict[str, Any]]]:
+    moves: dict[int, list[dict[str, Any]]] = {}
+    for row in rows:
+        targetIndex = ShardForEmail(row.email, shardCount)
+        if targetIndex != sourceIndex:
+            moves.setdefault(targetIndex, []).append(dict(row._mapping))
+    return moves
+
+
+def FindRebalanceConflicts(
+    engines: dict[str, Engine],
+    previousCount: int,
+    batchSize: int = REBALANCE_BATCH_SIZE,
+) -> list[str]:
+    """Find the users to move whose email is already taken on their new shard.
+
+    Such a conflict only happens when a server registered the email on the
+    new shard while the old shard still held it, see ``RebalanceShards``.
+
+    Parameters
+    ----------
+    engines : dict[str, Engine]
+        The engines of the new, larger list of shards.
+    previousCount : int
+        The number of shards before the growth.
+    batchSize : int
+        The number of users checked per query.
+
+    Returns
+    -------
+    list[str]
+        The conflicting emails.
+    """
+    from app.models import User
+
+    table = User.__table__
+    conflicts: list[str] = []
+
+    for sourceIndex in range(previousCount):
+        for rows in _IterateBatches(engines[str(sourceIndex)], table, batchSize):
+            moves = _GroupMoves(rows, sourceIndex, len(engines))
+
+            for targetIndex, movedRows in moves.items():
+                idByEmail = {row["email"]: row["id"] for row in movedRows}
+
+                with engines[str(targetIndex)].connect() as connection:
+                    existing = connection.execute(
+                        select(table.c.id, table.c.email).where(
+                            table.c.email.in_(list(idByEmail))
+                        )
+                    ).all()
+
+                conflicts.extend(
+                    row.email for row in existing if idByEmail[row.email] != row.id
+                )
+
+    return conflicts
+
+
+def _MoveRows(
+    engines: dict[str, Engine],
+    table: Table,
+    sourceIndex: int,
+    batchSize: int,
+) -> int:
+    source = engines[str(sourceIndex)]
+    movedCount = 0
+
+    for rows in _IterateBatches(source, table, batchSize):
+        moves = _GroupMoves(rows, sourceIndex, len(engines))
+
+        for targetIndex, movedRows in moves.items():
+            movedIds = [row["id"] for row in movedRows]
+
+            with engines[str(targetIndex)].begin() as connection:
+                connection.execute(delete(table).where(table.c.id.in_(movedIds)))
+                connection.execute(insert(table), movedRows)
+
+            with source.begin() as connection:
+                connection.execute(delete(table).where(table.c.id.in_(movedIds)))
+
+            movedCount += len(movedRows)
+
+    return movedCount
+
+
+def RebalanceShards(
+    shardURLs: list[str],
+    previousCount: int,
+    batchSize: int = REBALANCE_BATCH_SIZE,
+) -> dict[str, int]:
+    """Move users and their auth events to their owning shard after the shard
+    count has grown.
+
+    Both tables are sharded by email, so every row is moved on its own email.
+    Rows are copied to the new shard before being deleted from the old one,
+    so an interrupted run can simply be restarted.
+
+    The servers route by the shard list they were started with, so growing
+    the shards needs a downtime, in this order:
+
+    1. stop every server,
+    2. append the new URLs to ``DATABASE_SHARD_URLS`` and ``migrate up``,
+    3. run ``rebalance --previous-count N``,
+    4. start the servers again.
+
+    A server already running with the new list would not find the users that
+    were not moved yet, and would let their email register again on the new
+    shard. The run is refused while such a conflict exists, before moving
+    any row.
+
+    Parameters
+    ----------
+    shardURLs : list[str]
+        The new, larger list of shard URLs. The first ``previousCount`` entries
+        must be the shards that existed before.
+    previousCount : int
+        The number of shards before the growth.
+    batchSize : int
+        The number of rows processed per transaction.
+
+    Returns
+    -------
+    dict[str, int]
+        The number of moved rows per table name.
+
+    Raises
+    ------
+    RuntimeError
+        If a user to move has an email already registered on its new shard.
+    """
+    from app.models import AuthEvent, User
+
+    assert 0 < previousCount <= len(shardURLs), "Invalid previous shard count."
+
+    engines = CreateShardEngines(shardURLs)
+
+    conflicts = FindRebalanceConflicts(engines, previousCount, batchSize)
+    if conflicts:
+        raise RuntimeError(
+            f"{len(conflicts)} emails are registered on both their old and new"
+            f" shard ({', '.join(conflicts[:10])}). Stop the servers, resolve"
+            f" the duplicates and run the rebalance again."
+        )
+
+    movedCounts: dict[str, int] = {}
+
+    for table in (User.__table__, AuthEvent.__table__):
+        movedCounts[table.name] = sum(
+            _MoveRows(engines, table, sourceIndex, batchSize)
+            for sourceIndex in range(previousCount)
+        )
+
+    return movedCounts
+
+
+def main() -> None:
+    import argparse
+    import logging
+    from app.core import settings, logger
+
+    parser = argparse.ArgumentParser(
+        description="Rebalance the user shards. Stop every server first, see RebalanceShards."
+    )
+    parser.add_argument(
+        "--previous-count",
+        type=int,
+        required=True,
+        help="Number of shards before new ones were appended to DATABASE_SHARD_URLS",
+    )
+    args = parser.parse_args()
+    logger.setLevel(logging.INFO)
+
+    shardURLs = ParseShardURLs(settings.DATABASE_SHARD_URLS)
+    movedCounts = RebalanceShards(shardURLs, args.previous_count)
+    for tableName, movedCount in movedCounts.items():
+        logger.info(f"Moved {movedCount} {tableName} rows across {len(shardURLs)} shards.")
+
+
+if __name__ == "__main__":
+    main()
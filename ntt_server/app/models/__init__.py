@@ -1 +1,4 @@
 from .user import *
+from .auth_event import *
+from .idempotency_key import *
+from .backfill_checkpoint import *
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, String
+from app.db.base import Base
+
+
+class AuthEvent(Base):
+    __tablename__ = "auth_events"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, index=True, nullable=True)
+    email = Column(String, index=True, nullable=False)
+    event_type = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from app.db.base import Base
+
+
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+
+    name = Column(String, primary_key=True)
+    table_name = Column(String, nullable=False)
+    last_key = Column(String, nullable=True)
+    processed_count = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=True)
+    status = Column(String, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
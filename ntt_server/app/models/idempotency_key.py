@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, index=True, nullable=False)
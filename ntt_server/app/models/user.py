@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, DateTime, String
 from app.db.base import Base
 
 
@@ -8,3 +8,4 @@ class User(Base):
     id = Column(String, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
+    last_login_at = Column(DateTime, nullable=True)
@@ -1,2 +1,3 @@
 from .id_utils import *
 from .password_hash_utils import *
+from .response_utils import *
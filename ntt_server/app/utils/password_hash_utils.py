@@ -1,12 +1,21 @@
-from pwdlib import PasswordHash
+from functools import cache
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from pwdlib import PasswordHash
 
-hashUtils = PasswordHash.recommended()
+
+@cache
+def _HashUtils() -> "PasswordHash":
+    # pwdlib and argon2 are loaded on first use (the warm-up), not at import
+    from pwdlib import PasswordHash
+
+    return PasswordHash.recommended()
 
 
 def HashPassword(password: str) -> str:
-    return hashUtils.hash(password)
+    return _HashUtils().hash(password)
 
 
 def VerifyPassword(password: str, hashedPassword: str) -> bool:
-    return hashUtils.verify(password, hashedPassword)
+    return _HashUtils().verify(password, hashedPassword)
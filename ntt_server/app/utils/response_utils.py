@@ -0,0 +1,67 @@
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.responses import Response
+from app.core import settings
+
+
+__all__ = ["FastJSONResponse", "TrustedResponse", "DefaultResponseClass"]
+
+# read once, so the app-wide response class and the routes always agree
+fastJSONResponses = settings.FAST_JSON_RESPONSES
+
+
+def _EncodeDefault(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core or orjson.
+
+    Pydantic models are serialized straight to bytes by their compiled
+    serializer, other content goes through orjson instead of ``json.dumps``.
+
+    Unlike ``JSONResponse``, which raises on them, NaN and infinite floats
+    are rendered as ``null`` by both serializers.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+
+        import orjson
+
+        return orjson.dumps(content, default=_EncodeDefault)
+
+
+def TrustedResponse(content: BaseModel, statusCode: int) -> Any:
+    """Return a model built by the route itself without re-validating it.
+
+    FastAPI validates and re-encodes the returned value against the route's
+    ``response_model``. When ``FAST_JSON_RESPONSES`` is on, the model is
+    rendered directly instead; otherwise it is returned untouched.
+
+    Parameters
+    ----------
+    content : BaseModel
+        An instance of the route's response model.
+    statusCode : int
+        The status code of the route.
+
+    Returns
+    -------
+    Any
+        A ``FastJSONResponse``, or ``content`` when the fast path is off.
+    """
+    if not fastJSONResponses:
+        return content
+
+    return FastJSONResponse(content, status_code=statusCode)
+
+
+def DefaultResponseClass() -> type[Response]:
+    if fastJSONResponses:
+        return FastJSONResponse
+    return JSONResponse
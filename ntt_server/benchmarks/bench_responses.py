@@ -0,0 +1,60 @@
+"""Per-response serialization cost of the /users routes.
+
+Compares the default FastAPI path (``response_model`` validation, then
+``JSONResponse``) with ``TrustedResponse`` rendered by ``FastJSONResponse``.
+Run it from the server folder, with a .env file in place, or through
+``python help.py bench -f responses``.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from app.schemas import LoginResponse, RegisterResponse
+from app.utils import FastJSONResponse
+
+
+ROUNDS = 50000
+
+
+def _ResponseField(responseModel: type) -> APIRoute:
+    return APIRoute("/", lambda: None, response_model=responseModel).response_field
+
+
+async def MeasureDefault(content: object, responseModel: type, rounds: int) -> float:
+    field = _ResponseField(responseModel)
+
+    startedAt = time.perf_counter()
+    for _ in range(rounds):
+        serialized = await serialize_response(field=field, response_content=content)
+        JSONResponse(serialized).body
+    return (time.perf_counter() - startedAt) / rounds
+
+
+def MeasureFast(content: object, rounds: int) -> float:
+    startedAt = time.perf_counter()
+    for _ in range(rounds):
+        FastJSONResponse(content).body
+    return (time.perf_counter() - startedAt) / rounds
+
+
+def main() -> None:
+    for name, content in (
+        ("RegisterResponse", RegisterResponse()),
+        ("LoginResponse", LoginResponse(token="dummy_token")),
+    ):
+        default = asyncio.run(MeasureDefault(content, type(content), ROUNDS))
+        fast = MeasureFast(content, ROUNDS)
+        print(
+            f"{name:<18} default {default * 1e6:6.2f} us   fast {fast * 1e6:6.2f} us"
+            f"   saved {(default - fast) * 1e6:6.2f} us ({default / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
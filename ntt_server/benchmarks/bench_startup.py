@@ -0,0 +1,88 @@
+"""Cold start benchmark of the server and of the help.py tooling.
+
+Every measurement runs a fresh interpreter, so it includes the interpreter
+start up reported on the first line. The FastAPI and SQLAlchemy imports
+dominate the cold start and vary a lot between runs, so the server's own
+import cost is also measured in-process with them already loaded. Run it from the server folder, with a
+.env file in place, or through ``python help.py bench``.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROUNDS = 10
+SERVER_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_FOLDER = os.path.dirname(SERVER_FOLDER)
+FRAMEWORK_IMPORTS = "import fastapi, sqlalchemy.orm"
+
+
+def MeasureCommand(arguments: list[str], folder: str, rounds: int) -> list[float]:
+    durations = []
+    for _ in range(rounds):
+        startedAt = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *arguments],
+            cwd=folder,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        durations.append(time.perf_counter() - startedAt)
+
+    return durations
+
+
+def MeasureColdImport(statement: str, folder: str, rounds: int) -> list[float]:
+    return MeasureCommand(["-c", statement], folder, rounds)
+
+
+def MeasureImportAfter(
+    preload: str, statement: str, folder: str, rounds: int
+) -> list[float]:
+    script = (
+        f"import time\n{preload}\n"
+        f"startedAt = time.perf_counter()\n{statement}\n"
+        f"print(time.perf_counter() - startedAt)"
+    )
+
+    durations = []
+    for _ in range(rounds):
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=folder,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        durations.append(float(result.stdout.splitlines()[-1]))
+
+    return durations
+
+
+def Report(name: str, durations: list[float]) -> None:
+    print(
+        f"{name:<24} median {statistics.median(durations) * 1000:8.1f} ms"
+        f"   min {min(durations) * 1000:8.1f} ms"
+    )
+
+
+def main() -> None:
+    Report("interpreter", MeasureColdImport("pass", SERVER_FOLDER, ROUNDS))
+    Report("import server", MeasureColdImport("import server", SERVER_FOLDER, ROUNDS))
+    Report(
+        "import server (own)",
+        MeasureImportAfter(FRAMEWORK_IMPORTS, "import server", SERVER_FOLDER, ROUNDS),
+    )
+    # a real command that runs nothing: no benchmark file matches the filter
+    Report(
+        "help.py bench (no-op)",
+        MeasureCommand(["help.py", "bench", "-f", "__none__"], ROOT_FOLDER, ROUNDS),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,54 @@
 import os
+import shutil
 import sys
-from fastapi.testclient import TestClient
-from server import app
+import tempfile
+from alembic import command
+from alembic.config import Config
 import pytest
 
+testDatabaseFolder: str | None = None
+
+
+def _IsXdistController(config: pytest.Config) -> bool:
+    # the pytest-xdist controller only dispatches the tests to its workers
+    return not hasattr(config, "workerinput") and config.getoption(
+        "dist", "no"
+    ) != "no"
+
+
+def pytest_configure(config: pytest.Config):
+    global testDatabaseFolder
 
-def pytest_configure():
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+    if _IsXdistController(config):
+        return
+
+    # every pytest-xdist worker gets its own database, migrated to the Alembic
+    # head before the server (and its engine) is imported by the tests
+    testDatabaseFolder = tempfile.mkdtemp(
+        prefix=f"ntt_test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}_"
+    )
+    os.environ["DATABASE_URL"] = (
+        f"sqlite:///{os.path.join(testDatabaseFolder, 'test_db.sqlite')}"
+    )
+    os.environ["DATABASE_SHARD_URLS"] = ""
+
+    command.upgrade(
+        Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")),
+        "head",
+    )
+
+
+def pytest_unconfigure():
+    if testDatabaseFolder is not None:
+        shutil.rmtree(testDatabaseFolder, ignore_errors=True)
+
 
 @pytest.fixture
 def client():
+    from fastapi.testclient import TestClient
+    from server import app
+
     with TestClient(app) as c:
         yield c
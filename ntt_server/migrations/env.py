@@ -8,6 +8,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.db.base import Base
+from app.db.sharding import ParseShardURLs
 from app.models import *  # noqa: F401
 
 # this is the Alembic Config object, which provides
@@ -20,6 +21,12 @@ config.set_main_option(
     os.getenv("DATABASE_URL", "sqlite:///./ntt_server.db"),
 )
 
+# when the users table is sharded, every shard gets the same schema
+shard_urls = ParseShardURLs(os.getenv("DATABASE_SHARD_URLS"))
+if getattr(config.cmd_opts, "autogenerate", False):
+    # autogenerate diffs against a single database, the shards share its schema
+    shard_urls = shard_urls[:1]
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -49,16 +56,18 @@ def run_migrations_offline() -> None:
     script output.
 
     """
-    url = config.get_main_option("sqlalchemy.url")
-    context.configure(
-        url=url,
-        target_metadata=target_metadata,
-        literal_binds=True,
-        dialect_opts={"paramstyle": "named"},
-    )
+    urls = shard_urls or [config.get_main_option("sqlalchemy.url")]
+
+    for url in urls:
+        context.configure(
+            url=url,
+            target_metadata=target_metadata,
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+        )
 
-    with context.begin_transaction():
-        context.run_migrations()
+        with context.begin_transaction():
+            context.run_migrations()
 
 
 def run_migrations_online() -> None:
@@ -68,17 +77,27 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+    section = config.get_section(config.config_ini_section, {})
+    urls = shard_urls or [section["sqlalchemy.url"]]
+
+    for url in urls:
+        connectable = engine_from_config(
+            {**section, "sqlalchemy.url": url},
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+        )
+
+        with connectable.connect() as connection:
+            # one transaction per revision, so revisions running online backfills
+            # (see app.db.backfill) only commit their own work
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                transaction_per_migration=True,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
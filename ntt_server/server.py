@@ -1,60 +1,99 @@
+import asyncio
 import logging
+import os
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from app.core import settings, logger, RegisterFileLogger
-import argparse
+from app.utils import DefaultResponseClass
 
-parser = argparse.ArgumentParser(description="Run the FastAPI server.")
-parser.add_argument(
-    "--verbose",
-    "-v",
-    action="store_true",
-    help="Enable verbose logging",
-)
-parser.add_argument(
-    "--use-log-file",
-    "-u",
-    action="store_true",
-    help="Enable logging to a specified file in the .env file",
-)
 
-args = parser.parse_args()
+def ConfigureLogger() -> None:
+    if settings.LOG_VERBOSE:
+        logger.setLevel(logging.DEBUG)
+    else:
+        logger.setLevel(logging.INFO)
+
+    if settings.USE_LOG_FILE:
+        RegisterFileLogger(settings.LOG_FILE)
+
 
-if args.verbose:
-    logger.setLevel(logging.DEBUG)
-else:
-    logger.setLevel(logging.INFO)
+ConfigureLogger()
 
-if args.use_log_file:
-    RegisterFileLogger(settings.LOG_FILE)
+from app.middlewares import LoggingMiddleware
+from app.api.user import router as UserRouter
+from app.api.health import router as HealthRouter, WarmUp
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from app.core.audit import auditPipeline
+
     logger.info(f"Starting up the server in {settings.MODE}...")
-    yield
+    await auditPipeline.Start()
+    try:
+        warmUpTask = asyncio.create_task(run_in_threadpool(WarmUp, app))
+        yield
+        await warmUpTask
+    finally:
+        await auditPipeline.Stop()
     logger.info(f"Shutting down the server...")
 
 
-app = FastAPI(lifespan=lifespan)
+async def read_root():
+    return {"Hello": "World"}
 
-from app.middlewares import LoggingMiddleware
 
-app.add_middleware(LoggingMiddleware)
+def CreateApp() -> FastAPI:
+    """Build the application, with the response class picked at import."""
+    application = FastAPI(lifespan=lifespan, default_response_class=DefaultResponseClass())
+    application.add_middleware(LoggingMiddleware)
+    application.include_router(UserRouter)
+    application.include_router(HealthRouter)
+    application.get("/")(read_root)
 
-from app.api.user import router as UserRouter
+    return application
 
-app.include_router(UserRouter)
 
+app = CreateApp()
 
-@app.get("/")
-async def read_root():
-    return {"Hello": "World"}
+
+def ParseArgs():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the FastAPI server.")
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose logging",
+    )
+    parser.add_argument(
+        "--use-log-file",
+        "-u",
+        action="store_true",
+        help="Enable logging to a specified file in the .env file",
+    )
+
+    return parser.parse_args()
 
 
 def main():
     import uvicorn
 
+    args = ParseArgs()
+
+    # the worker and reloader processes import "server:app" again and only
+    # see the flags through the environment
+    if args.verbose:
+        os.environ["LOG_VERBOSE"] = "true"
+        settings.LOG_VERBOSE = True
+    if args.use_log_file:
+        os.environ["USE_LOG_FILE"] = "true"
+        settings.USE_LOG_FILE = True
+
+    ConfigureLogger()
+
     if settings.MODE == "development":
         uvicorn.run(
             "server:app",
@@ -65,13 +104,19 @@ def main():
             timeout_graceful_shutdown=5,
         )
     else:
-        uvicorn.run(
+        from app.core.launcher import RunProductionServer
+
+        config = uvicorn.Config(
             "server:app",
             host=f"{settings.HOST}",
             port=settings.PORT,
             log_config=None,
             timeout_graceful_shutdown=5,
+            backlog=settings.BACKLOG,
+            timeout_keep_alive=settings.TIMEOUT_KEEP_ALIVE,
+            limit_concurrency=settings.LIMIT_CONCURRENCY,
         )
+        RunProductionServer(config, workers=settings.WORKERS)
 
 
 if __name__ == "__main__":
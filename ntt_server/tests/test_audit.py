@@ -0,0 +1,145 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+import pytest  # type: ignore
+from fastapi.testclient import TestClient
+from server import app
+from app.core.audit import AuditPipeline, CreateAuthEvent, LOGIN_FAILURE, LOGIN_SUCCESS
+from app.db.session import SessionLocal
+from app.models import AuthEvent, User
+
+
+def test_login_events_are_flushed_on_shutdown():
+    email = f"{uuid.uuid4().hex}@example.com"
+
+    with TestClient(app) as client:
+        client.post("/users/register", json={"email": email, "password": "secret"})
+        assert (
+            client.post(
+                "/users/login", json={"email": email, "password": "wrong"}
+            ).status_code
+            == 401
+        )
+        assert (
+            client.post(
+                "/users/login", json={"email": email, "password": "secret"}
+            ).status_code
+            == 200
+        )
+
+    db = SessionLocal()
+    try:
+        events = db.query(AuthEvent).filter(AuthEvent.email == email).all()
+        user = db.query(User).filter(User.email == email).first()
+    finally:
+        db.close()
+
+    assert sorted(event.event_type for event in events) == [
+        "login_failure",
+        "login_success",
+    ]
+    assert user is not None and user.last_login_at is not None
+
+
+def _CreatePipeline(tmp_path, **kwargs) -> AuditPipeline:
+    options = {
+        "queueSize": 10,
+        "batchSize": 10,
+        "flushInterval": 60.0,
+        "overflow": "drop_oldest",
+        "useDatabase": False,
+        "filePath": str(tmp_path / "audit" / "events.ndjson"),
+    }
+    options.update(kwargs)
+    return AuditPipeline(**options)
+
+
+def _ReadEvents(tmp_path) -> list[dict]:
+    path = tmp_path / "audit" / "events.ndjson"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize(
+    "overflow, expected",
+    [("drop_oldest", ["b", "c"]), ("drop_newest", ["a", "b"])],
+)
+def test_overflow_drops_events(tmp_path, overflow, expected):
+    async def Scenario():
+        pipeline = _CreatePipeline(tmp_path, queueSize=2, overflow=overflow)
+        await pipeline.Start()
+        # the writer task cannot run in between, Record does not await here
+        for name in ("a", "b", "c"):
+            await pipeline.Record(CreateAuthEvent(LOGIN_FAILURE, f"{name}@example.com"))
+        await pipeline.Stop()
+        return pipeline
+
+    pipeline = asyncio.run(Scenario())
+
+    assert pipeline.droppedCount == 1
+    assert [event["email"] for event in _ReadEvents(tmp_path)] == [
+        f"{name}@example.com" for name in expected
+    ]
+
+
+def test_block_overflow_keeps_every_event(tmp_path):
+    async def Scenario():
+        pipeline = _CreatePipeline(tmp_path, queueSize=1, batchSize=1, overflow="block")
+        await pipeline.Start()
+        for name in ("a", "b", "c"):
+            await asyncio.wait_for(
+                pipeline.Record(CreateAuthEvent(LOGIN_FAILURE, f"{name}@example.com")), 5
+            )
+        await pipeline.Stop()
+        return pipeline
+
+    pipeline = asyncio.run(Scenario())
+
+    assert pipeline.droppedCount == 0
+    assert [event["email"] for event in _ReadEvents(tmp_path)] == [
+        "a@example.com",
+        "b@example.com",
+        "c@example.com",
+    ]
+
+
+def test_full_batch_is_written_before_the_interval(tmp_path):
+    async def Scenario():
+        pipeline = _CreatePipeline(tmp_path, batchSize=2, flushInterval=60.0)
+        await pipeline.Start()
+        for name in ("a", "b", "c"):
+            await pipeline.Record(
+                CreateAuthEvent(LOGIN_SUCCESS, f"{name}@example.com", userId=name)
+            )
+
+        for _ in range(100):
+            if _ReadEvents(tmp_path):
+                break
+            await asyncio.sleep(0.02)
+        written = _ReadEvents(tmp_path)
+
+        await pipeline.Stop()
+        return written
+
+    written = asyncio.run(Scenario())
+
+    assert [event["email"] for event in written] == ["a@example.com", "b@example.com"]
+    assert len(_ReadEvents(tmp_path)) == 3
+
+
+def test_file_output_is_ndjson(tmp_path):
+    async def Scenario():
+        pipeline = _CreatePipeline(tmp_path)
+        await pipeline.Start()
+        await pipeline.Record(CreateAuthEvent(LOGIN_SUCCESS, "a@example.com", userId="1"))
+        await pipeline.Stop()
+
+    asyncio.run(Scenario())
+
+    (event,) = _ReadEvents(tmp_path)
+    assert event["user_id"] == "1"
+    assert event["email"] == "a@example.com"
+    assert event["event_type"] == LOGIN_SUCCESS
+    assert datetime.fromisoformat(event["created_at"])
@@ -0,0 +1,34 @@
+import time
+import pytest  # type: ignore
+from fastapi.testclient import TestClient
+
+
+def test_liveness(client: TestClient):
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_after_warm_up(client: TestClient):
+    deadline = time.monotonic() + 10
+    response = client.get("/readyz")
+    while response.status_code == 503 and time.monotonic() < deadline:
+        time.sleep(0.1)
+        response = client.get("/readyz")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+def test_failed_warm_up_marks_process_unhealthy(client: TestClient, monkeypatch):
+    from server import app
+    from app.api.health import readiness, WarmUp
+
+    monkeypatch.setattr(readiness, "warmUpFailed", False)
+    monkeypatch.setattr(readiness, "warmedUp", False)
+    monkeypatch.setattr(app, "openapi", lambda: 1 / 0)
+
+    WarmUp(app)
+
+    assert client.get("/healthz").status_code == 503
+    assert client.get("/readyz").json() == {"detail": "Warm-up failed"}
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import uuid
+import pytest  # type: ignore
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.core.idempotency import (
+    DatabaseIdempotencyStore,
+    Fingerprint,
+    MemoryIdempotencyStore,
+)
+
+
+def test_register_retry_returns_stored_response(client: TestClient):
+    email = f"{uuid.uuid4().hex}@example.com"
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    body = {"email": email, "password": "secret"}
+
+    first = client.post("/users/register", json=body, headers=headers)
+    retry = client.post("/users/register", json=body, headers=headers)
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+
+
+def test_register_key_reused_with_other_request(client: TestClient):
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+
+    client.post(
+        "/users/register",
+        json={"email": f"{uuid.uuid4().hex}@example.com", "password": "secret"},
+        headers=headers,
+    )
+    response = client.post(
+        "/users/register",
+        json={"email": f"{uuid.uuid4().hex}@example.com", "password": "secret"},
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+
+
+def test_memory_store_duplicate_waits_for_original():
+    async def Scenario():
+        store = MemoryIdempotencyStore(maxEntries=10, ttl=60, waitTimeout=5)
+
+        assert await store.Begin("key", "fingerprint") is None
+        duplicate = asyncio.create_task(store.Begin("key", "fingerprint"))
+        await asyncio.sleep(0)
+        assert not duplicate.done()
+
+        await store.Complete("key", "fingerprint", 201, {})
+        assert await duplicate == (201, {})
+
+    asyncio.run(Scenario())
+
+
+def test_memory_store_is_bounded():
+    async def Scenario():
+        store = MemoryIdempotencyStore(maxEntries=2, ttl=60, waitTimeout=5)
+
+        for key in ("a", "b", "c"):
+            assert await store.Begin(key, "fingerprint") is None
+            await store.Complete(key, "fingerprint", 201, {})
+
+        assert await store.Begin("a", "fingerprint") is None
+        assert await store.Begin("c", "fingerprint") == (201, {})
+
+    asyncio.run(Scenario())
+
+
+def test_stored_fingerprint_is_keyed(client: TestClient, monkeypatch):
+    from app.core import idempotency
+    from app.db.session import SessionLocal
+    from app.models import IdempotencyKey
+
+    monkeypatch.setattr(
+        idempotency, "idempotencyStore", DatabaseIdempotencyStore(ttl=60, waitTimeout=5)
+    )
+    email = f"{uuid.uuid4().hex}@example.com"
+    key = uuid.uuid4().hex
+
+    response = client.post(
+        "/users/register",
+        json={"email": email, "password": "secret"},
+        headers={"Idempotency-Key": key},
+    )
+    assert response.status_code == 201
+
+    with SessionLocal() as db:
+        stored = db.get(IdempotencyKey, key)
+
+    assert stored.fingerprint == Fingerprint(email, "secret")
+    assert stored.fingerprint != hashlib.sha256(
+        f"{email}\0secret".encode("utf-8")
+    ).hexdigest()
+
+
+def test_memory_store_wait_is_bounded():
+    async def Scenario():
+        store = MemoryIdempotencyStore(maxEntries=10, ttl=60, waitTimeout=0.05)
+
+        assert await store.Begin("key", "fingerprint") is None
+        with pytest.raises(HTTPException) as e:
+            await store.Begin("key", "fingerprint")
+        assert e.value.status_code == 409
+
+    asyncio.run(Scenario())
+
+
+def test_database_store_takes_over_abandoned_claim():
+    async def Scenario():
+        store = DatabaseIdempotencyStore(ttl=60, waitTimeout=0.1)
+        key = uuid.uuid4().hex
+
+        assert await store.Begin(key, "fingerprint") is None
+        await asyncio.sleep(0.2)
+        assert await store.Begin(key, "fingerprint") is None
+
+        await store.Complete(key, "fingerprint", 201, {})
+        assert await store.Begin(key, "fingerprint") == (201, {})
+
+    asyncio.run(Scenario())
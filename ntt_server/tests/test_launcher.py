@@ -0,0 +1,91 @@
+import os
+import socket
+import pytest  # type: ignore
+from app.core import launcher
+from app.core.launcher import (
+    MAX_BOOT_FAILURES,
+    STARTUP_FAILURE,
+    PreforkSupervisor,
+    ResolveWorkerCount,
+)
+
+requiresFork = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+
+class StubConfig:
+    timeout_graceful_shutdown = None
+
+    def load(self) -> None:
+        pass
+
+    def bind_socket(self) -> socket.socket:
+        return socket.socket()
+
+
+def _StubServer(started: bool) -> type:
+    class StubServer:
+        def __init__(self, config: StubConfig) -> None:
+            self.started = False
+
+        def run(self, sockets: list[socket.socket]) -> None:
+            self.started = started
+
+    return StubServer
+
+
+class CountingSupervisor(PreforkSupervisor):
+    def __init__(self, *args, maxSpawns: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.spawnCount = 0
+        self._maxSpawns = maxSpawns
+
+    def _SpawnWorker(self, sock: socket.socket) -> None:
+        # only the supervisor gets back here, the forked worker exits inside
+        self.spawnCount += 1
+        if self.spawnCount >= self._maxSpawns:
+            self._shouldExit = True
+        super()._SpawnWorker(sock)
+
+
+@pytest.fixture
+def fastSupervisor(monkeypatch):
+    monkeypatch.setattr(launcher, "WORKER_RESTART_DELAY", 0)
+    monkeypatch.setattr(launcher, "SUPERVISOR_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(launcher.signal, "signal", lambda *args: None)
+
+
+def test_resolve_worker_count(monkeypatch):
+    assert ResolveWorkerCount(3) == 3
+
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    assert ResolveWorkerCount(0) == 2
+
+    monkeypatch.delattr(os, "sched_getaffinity", raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    assert ResolveWorkerCount(-1) == 4
+
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    assert ResolveWorkerCount(0) == 1
+
+
+@requiresFork
+def test_supervisor_restarts_exited_worker(fastSupervisor, monkeypatch):
+    monkeypatch.setattr(launcher.uvicorn, "Server", _StubServer(started=True))
+    supervisor = CountingSupervisor(StubConfig(), 1, maxSpawns=3)
+
+    supervisor.Run()
+
+    assert supervisor.spawnCount == 3
+    assert supervisor._bootFailures == 0
+
+
+@requiresFork
+def test_supervisor_stops_after_boot_failures(fastSupervisor, monkeypatch):
+    monkeypatch.setattr(launcher.uvicorn, "Server", _StubServer(started=False))
+    supervisor = CountingSupervisor(StubConfig(), 1, maxSpawns=MAX_BOOT_FAILURES * 2)
+
+    with pytest.raises(SystemExit) as e:
+        supervisor.Run()
+
+    assert e.value.code == STARTUP_FAILURE
+    assert supervisor.spawnCount == MAX_BOOT_FAILURES
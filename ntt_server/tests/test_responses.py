@@ -0,0 +1,81 @@
+import json
+import time
+import uuid
+import pytest  # type: ignore
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app.utils import response_utils
+from app.schemas import LoginResponse
+from app.utils import FastJSONResponse
+
+
+def test_fast_json_response_renders_models():
+    response = FastJSONResponse(LoginResponse(token="token"), status_code=200)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"token": "token"}
+
+
+def test_fast_json_response_renders_nested_models():
+    response = FastJSONResponse({"data": [LoginResponse(token="token")]})
+
+    assert json.loads(response.body) == {"data": [{"token": "token"}]}
+
+
+def _CallRoutes(client: TestClient) -> list[tuple[int, str, object]]:
+    from app.api.health import readiness
+
+    for _ in range(100):
+        if readiness.warmedUp:
+            break
+        time.sleep(0.05)
+
+    email = f"{uuid.uuid4().hex}@example.com"
+    responses = [
+        client.get("/"),
+        client.get("/healthz"),
+        client.get("/readyz"),
+        client.post("/users/register", json={"email": email, "password": "secret"}),
+        client.post("/users/login", json={"email": email, "password": "secret"}),
+        client.post("/users/login", json={"email": email, "password": "wrong"}),
+    ]
+    return [
+        (response.status_code, response.headers["content-type"], response.json())
+        for response in responses
+    ]
+
+
+def test_fast_json_app_matches_default(monkeypatch):
+    from server import CreateApp
+
+    renderedCount = 0
+    render = FastJSONResponse.render
+
+    def CountingRender(self, content):
+        nonlocal renderedCount
+        renderedCount += 1
+        return render(self, content)
+
+    monkeypatch.setattr(FastJSONResponse, "render", CountingRender)
+
+    monkeypatch.setattr(response_utils, "fastJSONResponses", False)
+    with TestClient(CreateApp()) as client:
+        default = _CallRoutes(client)
+    assert renderedCount == 0
+
+    monkeypatch.setattr(response_utils, "fastJSONResponses", True)
+    with TestClient(CreateApp()) as client:
+        fast = _CallRoutes(client)
+    # every route except the 401, rendered by the exception handler
+    assert renderedCount == 5
+
+    assert [status for status, _, _ in default] == [200, 200, 200, 201, 200, 401]
+    assert fast == default
+
+
+def test_fast_json_response_renders_nan_as_null():
+    response = FastJSONResponse({"value": float("nan")})
+
+    assert json.loads(response.body) == {"value": None}
+    with pytest.raises(ValueError):
+        JSONResponse({"value": float("nan")})
@@ -0,0 +1,149 @@
+import pytest  # type: ignore
+from datetime import datetime
+from sqlalchemy import insert, not_, or_, select
+from app.db.base import Base
+from app.db.sharding import (
+    CreateShardEngines,
+    CreateShardedSessionMaker,
+    JumpHash,
+    RebalanceShards,
+    ShardForEmail,
+)
+from app.models import AuthEvent, User
+
+
+def _CreateShards(tmp_path, count: int) -> list[str]:
+    shardURLs = [f"sqlite:///{tmp_path / f'shard_{index}.sqlite'}" for index in range(count)]
+    for engine in CreateShardEngines(shardURLs).values():
+        Base.metadata.create_all(engine)
+    return shardURLs
+
+
+def test_shard_for_email_normalizes():
+    assert ShardForEmail("User@Example.com ", 8) == ShardForEmail("user@example.com", 8)
+
+
+def test_jump_hash_only_moves_keys_to_new_bucket():
+    for key in range(1000):
+        before, after = JumpHash(key, 4), JumpHash(key, 5)
+        assert after in (before, 4)
+
+
+def test_sharded_session_routes_by_email(tmp_path):
+    shardURLs = _CreateShards(tmp_path, 3)
+    shardEngines = CreateShardEngines(shardURLs)
+    session = CreateShardedSessionMaker(shardEngines)()
+
+    emails = [f"user{index}@example.com" for index in range(20)]
+    for index, email in enumerate(emails):
+        session.add(User(id=str(index), email=email, hashed_password="hash"))
+    session.commit()
+
+    for email in emails:
+        user = session.query(User).filter(User.email == email).first()
+        assert user is not None
+        assert session.get_bind(instance=user) is shardEngines[
+            str(ShardForEmail(email, 3))
+        ]
+
+    session.close()
+
+
+def test_sharded_session_queries_every_shard_for_or(tmp_path):
+    shardURLs = _CreateShards(tmp_path, 4)
+    session = CreateShardedSessionMaker(CreateShardEngines(shardURLs))()
+
+    emails = [f"user{index}@example.com" for index in range(20)]
+    for index, email in enumerate(emails):
+        session.add(User(id=str(index), email=email, hashed_password="hash"))
+    session.commit()
+
+    other = next(
+        index
+        for index, email in enumerate(emails)
+        if ShardForEmail(email, 4) != ShardForEmail(emails[0], 4)
+    )
+
+    rows = session.query(User).filter(
+        or_(User.email == emails[0], User.id == str(other))
+    ).all()
+    assert sorted(user.id for user in rows) == sorted(["0", str(other)])
+
+    rows = session.query(User).filter(not_(User.email == emails[0])).all()
+    assert len(rows) == len(emails) - 1
+
+    rows = session.query(User).filter(
+        User.email == emails[0], User.hashed_password == "hash"
+    ).all()
+    assert [user.id for user in rows] == ["0"]
+
+    session.close()
+
+
+def test_rebalance_moves_users_to_new_shards(tmp_path):
+    shardURLs = _CreateShards(tmp_path, 3)
+    emails = [f"user{index}@example.com" for index in range(50)]
+
+    session = CreateShardedSessionMaker(CreateShardEngines(shardURLs[:2]))()
+    for index, email in enumerate(emails):
+        session.add(User(id=str(index), email=email, hashed_password="hash"))
+    session.commit()
+    session.close()
+
+    previousEngines = CreateShardEngines(shardURLs[:2])
+    for index, email in enumerate(emails):
+        with previousEngines[str(ShardForEmail(email, 2))].begin() as connection:
+            connection.execute(
+                insert(AuthEvent.__table__).values(
+                    id=f"event{index}",
+                    user_id=str(index),
+                    email=email,
+                    event_type="login_success",
+                    created_at=datetime(2024, 1, 1),
+                )
+            )
+
+    movedCount = sum(ShardForEmail(email, 3) == 2 for email in emails)
+    assert RebalanceShards(shardURLs, previousCount=2, batchSize=7) == {
+        "users": movedCount,
+        "auth_events": movedCount,
+    }
+
+    for shardId, engine in CreateShardEngines(shardURLs).items():
+        with engine.connect() as connection:
+            eventEmails = connection.execute(
+                select(AuthEvent.__table__.c.email)
+            ).scalars().all()
+        assert all(str(ShardForEmail(email, 3)) == shardId for email in eventEmails)
+
+    session = CreateShardedSessionMaker(CreateShardEngines(shardURLs))()
+    assert len(session.query(User).all()) == len(emails)
+    for email in emails:
+        assert session.query(User).filter(User.email == email).first() is not None
+    session.close()
+
+
+def test_rebalance_refuses_conflicting_emails(tmp_path):
+    shardURLs = _CreateShards(tmp_path, 3)
+    email = next(
+        f"user{index}@example.com"
+        for index in range(100)
+        if ShardForEmail(f"user{index}@example.com", 3) == 2
+    )
+    engines = CreateShardEngines(shardURLs)
+
+    # registered on the old shard, then again by a server using the new list
+    with engines[str(ShardForEmail(email, 2))].begin() as connection:
+        connection.execute(
+            insert(User.__table__).values(id="old", email=email, hashed_password="hash")
+        )
+    with engines["2"].begin() as connection:
+        connection.execute(
+            insert(User.__table__).values(id="new", email=email, hashed_password="hash")
+        )
+
+    with pytest.raises(RuntimeError, match=email):
+        RebalanceShards(shardURLs, previousCount=2)
+
+    with engines[str(ShardForEmail(email, 2))].connect() as connection:
+        assert connection.execute(select(User.__table__.c.id)).scalars().all() == ["old"]